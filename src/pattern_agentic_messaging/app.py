@@ -31,6 +31,11 @@ from .utils import parse_name
 
 logger = logging.getLogger(__name__)
 
+# Queued by task done-callbacks to wake the messages() consumer for shutdown
+_SENTINEL = object()
+# Upper bound on messages taken from a queue per wakeup, for fairness
+_MAX_DRAIN = 64
+
 try:
     from pydantic import BaseModel, ValidationError
     PYDANTIC_AVAILABLE = True
@@ -132,10 +137,17 @@ class PASlimApp:
         self._app: Optional[App] = None
         self._conn_id: Optional[int] = None
         self._message_handlers = []
+        # Compiled from _message_handlers at registration:
+        # field -> value -> (index, handler_info), first registration wins
+        self._dispatch: dict[str, dict[object, tuple[int, dict]]] = {}
+        self._structural_handlers: list[tuple[int, dict]] = []
+        self._catch_all: Optional[dict] = None
         self._session_connect_handler = None
         self._session_disconnect_handler = None
         self._init_handlers = []
         self._running = True
+        # Created by each messages() call, since an Event binds to the loop that waits on it
+        self._stop_event: Optional[asyncio.Event] = None
         self.session_token_verifier = None
         self._audit_publisher = None
 
@@ -289,7 +301,7 @@ class PASlimApp:
                         model, self.config.message_discriminator
                     )
 
-            self._message_handlers.append({
+            handler_info = {
                 'discriminator': disc_field,
                 'value': disc_value,
                 'handler': func,
@@ -297,7 +309,21 @@ class PASlimApp:
                 'discriminator_value': model_disc_value,
                 'required_keys': _extract_required_keys(model) if model else None,
                 'injection': _inspect_handler(func),
-            })
+            }
+            index = len(self._message_handlers)
+            self._message_handlers.append(handler_info)
+
+            if model:
+                if model_disc_value is not None:
+                    self._dispatch.setdefault(self.config.message_discriminator, {}).setdefault(
+                        model_disc_value, (index, handler_info)
+                    )
+                else:
+                    self._structural_handlers.append((index, handler_info))
+            elif disc_field is not None:
+                self._dispatch.setdefault(disc_field, {}).setdefault(disc_value, (index, handler_info))
+            elif self._catch_all is None:
+                self._catch_all = handler_info
             return func
 
         # Direct decoration: @app.on_message
@@ -364,6 +390,8 @@ class PASlimApp:
     def stop(self):
         """Stop the application gracefully."""
         self._running = False
+        if self._stop_event is not None:
+            self._stop_event.set()
 
     def run(self):
         """
@@ -402,8 +430,16 @@ class PASlimApp:
             elif main_task and not main_task.done():
                 main_task.cancel()
 
+        # Windows event loops don't support add_signal_handler; there we install a
+        # process-level handler that hops onto the loop, and restore the old one after
+        previous_handlers = {}
         for s in (sig.SIGTERM, sig.SIGINT):
-            loop.add_signal_handler(s, signal_handler)
+            try:
+                loop.add_signal_handler(s, signal_handler)
+            except NotImplementedError:
+                previous_handlers[s] = sig.signal(
+                    s, lambda signum, frame: loop.call_soon_threadsafe(signal_handler)
+                )
 
         try:
             main_task = loop.create_task(self._run_async())
@@ -412,7 +448,10 @@ class PASlimApp:
             pass
         finally:
             for s in (sig.SIGTERM, sig.SIGINT):
-                loop.remove_signal_handler(s)
+                if s in previous_handlers:
+                    sig.signal(s, previous_handlers[s])
+                else:
+                    loop.remove_signal_handler(s)
             loop.close()
 
     async def _run_async(self):
@@ -420,17 +459,6 @@ class PASlimApp:
         if not self._message_handlers:
             raise ValueError("No message handlers registered. Use @app.on_message decorator.")
 
-        # Find catch-all handler (no discriminator, no model)
-        catch_all_info = None
-        for handler_info in self._message_handlers:
-            if (handler_info['discriminator'] is None
-                    and handler_info.get('discriminator_value') is None
-                    and handler_info.get('model') is None):
-                catch_all_info = handler_info
-                break
-
-        disc_field = self.config.message_discriminator
-
         async with self:
             for init_handler in self._init_handlers:
                 try:
@@ -444,72 +472,64 @@ class PASlimApp:
                     break
 
                 matched = False
-                for handler_info in self._message_handlers:
-                    disc = handler_info['discriminator']
-                    val = handler_info['value']
-                    handler = handler_info['handler']
-                    model = handler_info.get('model')
-                    model_disc_val = handler_info.get('discriminator_value')
-                    required_keys = handler_info.get('required_keys')
-                    injection = handler_info['injection']
-
-                    if model and isinstance(msg, dict):
+                if isinstance(msg, dict):
+                    keyed = self._match_keyed_handler(msg)
+
+                    # Model-only handlers registered before the keyed match get first try:
+                    # structural pre-check then try-validate
+                    for index, handler_info in self._structural_handlers:
+                        if keyed is not None and index > keyed[0]:
+                            break
+                        if not handler_info['required_keys'] <= msg.keys():
+                            continue
+                        model = handler_info['model']
+                        try:
+                            parsed = model.model_validate(msg)
+                        except ValidationError:
+                            continue
+                        matched = True
+                        handler = handler_info['handler']
+                        try:
+                            await _call_handler(handler, session, parsed, msg_ctx, handler_info['injection'], self.session_token_verifier)
+                        except Exception as exc:
+                            logger.error(f"Error in handler '{handler.__name__}' for message type '{model.__name__}': {exc}", exc_info=True)
+                        break
+
+                    if not matched and keyed is not None:
+                        matched = True
+                        handler_info = keyed[1]
+                        handler = handler_info['handler']
+                        model = handler_info['model']
+                        injection = handler_info['injection']
+
                         # Discriminator-matched model handler
-                        if model_disc_val is not None:
-                            if msg.get(disc_field) != model_disc_val:
-                                continue
+                        if model:
                             try:
                                 parsed = model.model_validate(msg)
-                                matched = True
-                                try:
-                                    await _call_handler(handler, session, parsed, msg_ctx, injection, self.session_token_verifier)
-                                except Exception as exc:
-                                    logger.error(f"Error in handler '{handler.__name__}' for message type '{model.__name__}': {exc}", exc_info=True)
-                                break
                             except ValidationError as e:
-                                matched = True
                                 await session.send({
                                     "error": "validation_error",
                                     "details": e.errors()
                                 })
-                                break
-
-                        # Model-only handler: structural pre-check then try-validate
-                        elif required_keys is not None:
-                            if not required_keys <= msg.keys():
-                                continue
-                            try:
-                                parsed = model.model_validate(msg)
-                                matched = True
+                            else:
                                 try:
                                     await _call_handler(handler, session, parsed, msg_ctx, injection, self.session_token_verifier)
                                 except Exception as exc:
                                     logger.error(f"Error in handler '{handler.__name__}' for message type '{model.__name__}': {exc}", exc_info=True)
-                                break
-                            except ValidationError:
-                                continue
-
-                    # Legacy dict-based handler
-                    elif disc is not None:
-                        if isinstance(msg, dict) and msg.get(disc) == val:
-                            matched = True
+
+                        # Legacy dict-based handler
+                        else:
                             try:
                                 await _call_handler(handler, session, msg, msg_ctx, injection, self.session_token_verifier)
                             except Exception as exc:
+                                disc, val = handler_info['discriminator'], handler_info['value']
                                 logger.error(f"Error in handler '{handler.__name__}' for discriminator {disc}={val}: {exc}", exc_info=True)
-                            break
 
                 # Fall back to catch-all if no specific handler matched
-                if not matched and catch_all_info:
-                    handler = catch_all_info['handler']
-                    model = catch_all_info.get('model')
-                    injection = catch_all_info['injection']
+                if not matched and self._catch_all:
+                    handler = self._catch_all['handler']
                     try:
-                        if model and isinstance(msg, dict):
-                            parsed = model.model_validate(msg)
-                            await _call_handler(handler, session, parsed, msg_ctx, injection, self.session_token_verifier)
-                        else:
-                            await _call_handler(handler, session, msg, msg_ctx, injection, self.session_token_verifier)
+                        await _call_handler(handler, session, msg, msg_ctx, self._catch_all['injection'], self.session_token_verifier)
                     except ValidationError as e:
                         await session.send({
                             "error": "validation_error",
@@ -520,6 +540,18 @@ class PASlimApp:
                 elif not matched:
                     logger.warning(f"No handler for message: {msg}")
 
+    def _match_keyed_handler(self, msg: dict) -> Optional[tuple[int, dict]]:
+        """Return the earliest-registered (index, handler_info) whose discriminator matches msg."""
+        keyed = None
+        for field, by_value in self._dispatch.items():
+            try:
+                entry = by_value.get(msg.get(field))
+            except TypeError:  # unhashable value, can't match any registration
+                continue
+            if entry is not None and (keyed is None or entry[0] < keyed[0]):
+                keyed = entry
+        return keyed
+
     def _session_config(self, session_type: SessionType) -> SessionConfig:
         return SessionConfig(
             session_type=session_type,
@@ -529,6 +561,18 @@ class PASlimApp:
             metadata={},
         )
 
+    def _wrap_session(self, session_cls: type[PASlimSession], slim_session, peer_name: str = ""):
+        return session_cls(
+            slim_session,
+            audit_publisher=self._audit_publisher,
+            local_name=self.config.local_name,
+            peer_name=peer_name,
+            send_batch=self.config.send_batch,
+            batch_interval=self.config.send_batch_interval,
+            batch_max=self.config.send_batch_max,
+            max_buffered=self.config.max_inflight,
+        )
+
     async def connect(self, peer_name: str, timeout: Optional[float] = None) -> PASlimP2PSession:
         """
         Connect to a peer (P2P Active mode).
@@ -552,7 +596,7 @@ class PASlimApp:
             ),
             timeout=connect_timeout,
         )
-        return PASlimP2PSession(session, audit_publisher=self._audit_publisher, local_name=self.config.local_name, peer_name=peer_name)
+        return self._wrap_session(PASlimP2PSession, session, peer_name=peer_name)
 
     async def accept(self) -> PASlimP2PSession:
         """
@@ -562,7 +606,7 @@ class PASlimApp:
             PASlimP2PSession for the incoming connection
         """
         session = await self._app.listen_for_session_async(None)
-        return PASlimP2PSession(session, audit_publisher=self._audit_publisher, local_name=self.config.local_name)
+        return self._wrap_session(PASlimP2PSession, session)
 
     async def create_channel(self, channel_name: str, invites: list[str] = None) -> PASlimGroupSession:
         """
@@ -582,7 +626,7 @@ class PASlimApp:
         slim_session = await self._app.create_session_and_wait_async(
             self._session_config(SessionType.GROUP), channel
         )
-        session = PASlimGroupSession(slim_session, audit_publisher=self._audit_publisher, local_name=self.config.local_name, peer_name=channel_name)
+        session = self._wrap_session(PASlimGroupSession, slim_session, peer_name=channel_name)
 
         for invite in invites:
             participant = parse_name(invite)
@@ -599,7 +643,7 @@ class PASlimApp:
             PASlimGroupSession for the channel
         """
         session = await self._app.listen_for_session_async(None)
-        return PASlimGroupSession(session, audit_publisher=self._audit_publisher, local_name=self.config.local_name)
+        return self._wrap_session(PASlimGroupSession, session)
 
     async def listen(self) -> AsyncIterator[PASlimP2PSession]:
         """
@@ -610,7 +654,7 @@ class PASlimApp:
         """
         while True:
             session = await self._app.listen_for_session_async(None)
-            yield PASlimP2PSession(session, audit_publisher=self._audit_publisher, local_name=self.config.local_name)
+            yield self._wrap_session(PASlimP2PSession, session)
 
     async def messages(self) -> AsyncIterator[tuple[PASlimSession, MessageContext, MessagePayload]]:
         """
@@ -627,7 +671,8 @@ class PASlimApp:
                 async for session, msg in app:
                     await session.send(response)
         """
-        message_queue: asyncio.Queue = asyncio.Queue()
+        # Bounded so a slow consumer pushes back on the session readers
+        message_queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_inflight)
         session_tasks: set[asyncio.Task] = set()
         listener_task: Optional[asyncio.Task] = None
 
@@ -647,7 +692,12 @@ class PASlimApp:
                             msg_ctx, msg = await session._next_with_context()
                         except StopAsyncIteration:
                             break
-                        await message_queue.put((session, msg_ctx, msg))
+                        item = (session, msg_ctx, msg)
+                        if message_queue.full():
+                            await message_queue.put(item)
+                        else:
+                            # Common case: hand straight to the consumer without a put() coroutine
+                            message_queue.put_nowait(item)
             except (StopAsyncIteration, asyncio.CancelledError):
                 pass
             except Exception as e:
@@ -667,44 +717,57 @@ class PASlimApp:
                 session_tasks.add(task)
                 task.add_done_callback(session_tasks.discard)
 
+        shutting_down = False
+
+        def _wake_consumer(_):
+            nonlocal shutting_down
+            shutting_down = True
+            try:
+                message_queue.put_nowait(_SENTINEL)
+            except asyncio.QueueFull:
+                pass  # consumer isn't blocked on get(); it sees shutting_down before the next one
+
+        listener_error: Optional[BaseException] = None
+
+        def _on_listener_done(task: asyncio.Task):
+            nonlocal listener_error
+            if not task.cancelled():
+                listener_error = task.exception()
+            _wake_consumer(task)
+
+        stop_task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
         try:
             listener_task = asyncio.create_task(session_listener())
+            listener_task.add_done_callback(_on_listener_done)
+            stop_task = asyncio.create_task(self._stop_event.wait())
+            stop_task.add_done_callback(_wake_consumer)
+
+            while self._running and not shutting_down:
+                # One await per burst: take whatever else is already queued too
+                batch = [await message_queue.get()]
+                while len(batch) < _MAX_DRAIN:
+                    try:
+                        batch.append(message_queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                for item in batch:
+                    if item is _SENTINEL or not self._running:
+                        break
+                    yield item
+                else:
+                    continue
+                break
 
-            while self._running:
-                # Check if listener crashed
-                if listener_task.done():
-                    exc = listener_task.exception()
-                    if exc:
-                        raise exc
-                    break  # Listener ended (shouldn't happen)
-
-                # Get next message with timeout to periodically check listener health
-                try:
-                    session, msg_ctx, msg = await asyncio.wait_for(
-                        message_queue.get(),
-                        timeout=0.1
-                    )
-                    yield (session, msg_ctx, msg)
-                except asyncio.TimeoutError:
-                    continue  # No message yet, loop back
+            if listener_error:
+                raise listener_error
 
         finally:
-            # Cleanup: cancel all tasks with timeout to avoid hanging
-            if listener_task and not listener_task.done():
-                listener_task.cancel()
-                try:
-                    await asyncio.wait_for(listener_task, timeout=0.5)
-                except (asyncio.CancelledError, asyncio.TimeoutError):
-                    pass
-
-            for task in list(session_tasks):
+            # Cleanup: cancel all tasks, then wait once with a timeout to avoid hanging.
+            # The listener is cancelled in the same pass, so it can't add readers meanwhile
+            tasks = {task for task in (listener_task, stop_task) if task} | session_tasks
+            for task in tasks:
                 task.cancel()
-
-            if session_tasks:
-                try:
-                    await asyncio.wait_for(
-                        asyncio.gather(*session_tasks, return_exceptions=True),
-                        timeout=0.5
-                    )
-                except asyncio.TimeoutError:
-                    pass
+            if tasks:
+                await asyncio.wait(tasks, timeout=0.5)
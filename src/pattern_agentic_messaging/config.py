@@ -7,6 +7,12 @@ from typing import Optional
 _DEFAULT_TOKEN_DURATION = timedelta(seconds=3600)
 
 
+def _check_name(field_name: str, value: str) -> None:
+    """Reject names that SLIM can't parse as 'org/namespace/app'."""
+    if len(value.split('/')) != 3:
+        raise ValueError(f"{field_name} must be of the form 'org/namespace/app', got {value!r}")
+
+
 @dataclass
 class PASlimConfig:
     local_name: str
@@ -30,6 +36,15 @@ class PASlimConfig:
     audit_nats_url: Optional[str] = None
     audit_nats_subject_prefix: str = "pa.audit.messages"
     audit_nats_creds_file: Optional[str] = None
+    max_inflight: int = 1024
+    send_batch: bool = False
+    send_batch_interval: float = 0.001
+    send_batch_max: int = 256
+
+    def __post_init__(self):
+        # An empty local_name is a template to be filled in with dataclasses.replace()
+        if self.local_name:
+            _check_name("local_name", self.local_name)
 
     def with_no_auth(self) -> PASlimConfig:
         self.auth_type = "none"
@@ -66,8 +81,20 @@ class PASlimConfig:
 class PASlimConfigP2P(PASlimConfig):
     peer_name: Optional[str] = None
 
+    def __post_init__(self):
+        super().__post_init__()
+        if self.peer_name:
+            _check_name("peer_name", self.peer_name)
+
 
 @dataclass
 class PASlimConfigGroup(PASlimConfig):
     channel_name: Optional[str] = None
     invites: list[str] = field(default_factory=list)
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.channel_name:
+            _check_name("channel_name", self.channel_name)
+        for invite in self.invites or ():
+            _check_name("invites", invite)
@@ -10,6 +10,48 @@ except ImportError:
     PYDANTIC_AVAILABLE = False
     BaseModel = None
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Reused across calls; json.dumps(...) with custom separators builds a new encoder each time
+_encoder = json.JSONEncoder(separators=(',', ':'))
+
+def _json_dumps(obj) -> bytes:
+    return _encoder.encode(obj).encode('utf-8')
+
+if ORJSON_AVAILABLE:
+    def _dumps(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except orjson.JSONEncodeError:
+            # orjson rejects some payloads json accepts, e.g. integers beyond 64 bits
+            return _json_dumps(obj)
+
+    # orjson rejects some JSON that json accepts (NaN and Infinity, floats out of range,
+    # lone surrogates), so those are retried before the payload is treated as text
+    def _loads(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data)
+
+    def _loads_utf8(data: bytes):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return json.loads(data.decode('utf-8'))
+else:
+    _dumps = _json_dumps
+    _loads = json.loads
+
+    def _loads_utf8(data: bytes):
+        # json.loads(bytes) would also sniff UTF-16/32; payloads are UTF-8 only
+        return json.loads(data.decode('utf-8'))
+
 def encode_message(payload: MessagePayload) -> bytes:
     if isinstance(payload, bytes):
         return payload
@@ -17,24 +59,35 @@ def encode_message(payload: MessagePayload) -> bytes:
         return payload.encode('utf-8')
     if PYDANTIC_AVAILABLE and isinstance(payload, BaseModel):
         try:
-            return json.dumps(payload.model_dump()).encode('utf-8')
+            # Serialized straight to bytes by pydantic-core, skipping the intermediate dict
+            return payload.__pydantic_serializer__.to_json(payload)
         except (TypeError, ValueError) as e:
             raise SerializationError(f"Failed to encode Pydantic model: {e}")
     if isinstance(payload, dict):
         try:
-            return json.dumps(payload).encode('utf-8')
+            return _dumps(payload)
         except (TypeError, ValueError) as e:
             raise SerializationError(f"Failed to encode dict: {e}")
     raise SerializationError(f"Unsupported payload type: {type(payload)}")
 
+# First bytes of a JSON object/array payload, the common case on the wire
+_JSON_CONTAINER_START = (b'{', b'[')
+
 def decode_message(data: bytes) -> Union[dict, str, bytes]:
+    if data[:1] in _JSON_CONTAINER_START:
+        # Parsed as strict UTF-8, and both parsers reject raw control characters,
+        # so a successful parse needs no null-byte scan
+        try:
+            return _loads_utf8(data)
+        except ValueError:
+            pass
     try:
         text = data.decode('utf-8', errors='strict')
         if '\x00' in text:
             return data
         try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+            return _loads(text)
+        except ValueError:
             return text
     except UnicodeDecodeError:
         return data
@@ -1,76 +1,193 @@
 import asyncio
 import logging
+import random
 import uuid
+from collections import deque
 from typing import Optional, Callable, Any, Dict
 from datetime import timedelta
+from slim_bindings import SlimError
 from .types import MessagePayload
 from .messages import encode_message, decode_message
 from .exceptions import SessionClosedError, TimeoutError as PATimeoutError
-from .session_token import SESSION_TOKEN_METADATA_KEY
+from .session_token import SESSION_TOKEN_METADATA_KEY, PatternAgentSessionToken
 from .message_types import tag_a2a_message
 from .utils import parse_name
 
 logger = logging.getLogger(__name__)
 
+# Request ids start at a random offset below 2**52 so they stay exact in JS doubles and
+# don't collide with the peer's own request counter
+_REQUEST_ID_BITS = 52
+# Queued by the reader task when it stops
+_END_OF_STREAM = object()
+
+def _log_callback_error(callback: Callable, e: BaseException):
+    callback_name = getattr(callback, '__name__', repr(callback))
+    logger.error(f"Error in callback '{callback_name}': {e}", exc_info=e)
+
 class PASlimSession:
-    def __init__(self, slim_session, *, audit_publisher=None, local_name: str = "", peer_name: str = ""):
+    def __init__(
+        self,
+        slim_session,
+        *,
+        audit_publisher=None,
+        local_name: str = "",
+        peer_name: str = "",
+        send_batch: bool = False,
+        batch_interval: float = 0.001,
+        batch_max: int = 256,
+        max_buffered: int = 1024,
+    ):
         self._session = slim_session
-        self._session_id = str(uuid.uuid4())
+        # Generated on first access; many short-lived server sessions never need one
+        self._session_id: Optional[str] = None
         self.context: Dict[str, Any] = {}
-        self._queue: asyncio.Queue = asyncio.Queue()
+        # Single producer (_read_loop), single consumer (__anext__): a deque plus a wakeup event,
+        # created along with the reader
+        self._buf: deque = deque()
+        self._avail: Optional[asyncio.Event] = None
+        # The reader pauses at max_buffered unread messages so a slow consumer pushes back on
+        # SLIM, unless callbacks or pending requests still need it to read; _space wakes it
+        self._max_buffered = max_buffered
+        self._space: Optional[asyncio.Event] = None
         self._read_task: Optional[asyncio.Task] = None
-        self._callbacks: list[Callable] = []
-        self._pending_requests: dict[str, asyncio.Future] = {}
+        self._entered = False
+        # Split once at registration so delivery needn't inspect each callback
+        self._sync_callbacks: list[Callable] = []
+        self._async_callbacks: list[Callable] = []
+        self._pending_requests: dict[int, asyncio.Future] = {}
+        self._next_request_id = random.getrandbits(_REQUEST_ID_BITS)
         self._closed = False
         self._outgoing_metadata: dict[str, str] = {}
         self._audit_publisher = audit_publisher
         self._local_name = local_name
         self._peer_name = peer_name
+        # Opt-in send batching: send() buffers and a flush task publishes every batch_interval
+        self._send_batch = send_batch
+        self._batch_interval = batch_interval
+        self._batch_max = batch_max
+        # (data, metadata, request_id): the id lets a failed flush fail the waiting request()
+        self._send_buf: list[tuple[bytes, Optional[dict[str, str]], Optional[int]]] = []
+        self._send_pending = asyncio.Event() if send_batch else None
+        self._send_lock = asyncio.Lock() if send_batch else None
+        self._send_flush_task: Optional[asyncio.Task] = None
 
     @property
     def session_id(self) -> str:
+        if self._session_id is None:
+            self._session_id = str(uuid.uuid4())
         return self._session_id
 
-    async def _read_loop(self):
-        while not self._closed:
+    async def _process(self, received) -> Optional[tuple]:
+        """Handle one received message; returns (msg_ctx, decoded), or None if it answered a request."""
+        msg_ctx = received.context
+        decoded = decode_message(received.payload)
+
+        incoming_metadata = getattr(msg_ctx, 'metadata', None) or {}
+        if SESSION_TOKEN_METADATA_KEY in incoming_metadata:
+            self._outgoing_metadata[SESSION_TOKEN_METADATA_KEY] = incoming_metadata[SESSION_TOKEN_METADATA_KEY]
+
+        if self._pending_requests and isinstance(decoded, dict):
+            request_id = decoded.get("_request_id")
+            future = self._pending_requests.pop(request_id, None) if type(request_id) is int else None
+            if future is not None and not future.done():
+                future.set_result(decoded)
+                return None
+
+        for callback in self._sync_callbacks:
             try:
-                received = await self._session.get_message_async(None)
-                msg_ctx = received.context
-                payload = received.payload
-                decoded = decode_message(payload)
-
-                incoming_metadata = getattr(msg_ctx, 'metadata', None) or {}
-                if SESSION_TOKEN_METADATA_KEY in incoming_metadata:
-                    self._outgoing_metadata[SESSION_TOKEN_METADATA_KEY] = incoming_metadata[SESSION_TOKEN_METADATA_KEY]
-
-                if isinstance(decoded, dict) and "_request_id" in decoded:
-                    request_id = decoded["_request_id"]
-                    if request_id in self._pending_requests:
-                        self._pending_requests[request_id].set_result(decoded)
-                        continue
-
-                for callback in self._callbacks:
-                    try:
-                        if asyncio.iscoroutinefunction(callback):
-                            await callback(decoded)
-                        else:
-                            callback(decoded)
-                    except Exception as e:
-                        callback_name = getattr(callback, '__name__', repr(callback))
-                        logger.error(f"Error in callback '{callback_name}': {e}", exc_info=True)
-
-                await self._queue.put((msg_ctx, decoded))
+                callback(decoded)
             except Exception as e:
-                if not self._closed:
-                    logger.error(f"Read loop error: {e}", exc_info=True)
-                break
+                _log_callback_error(callback, e)
+
+        if len(self._async_callbacks) == 1:
+            callback = self._async_callbacks[0]
+            try:
+                await callback(decoded)
+            except Exception as e:
+                _log_callback_error(callback, e)
+        elif self._async_callbacks:
+            callbacks = tuple(self._async_callbacks)
+            results = await asyncio.gather(
+                *(callback(decoded) for callback in callbacks),
+                return_exceptions=True,
+            )
+            for callback, result in zip(callbacks, results):
+                if isinstance(result, Exception):
+                    _log_callback_error(callback, result)
+
+        return msg_ctx, decoded
+
+    async def _read_loop(self):
+        try:
+            while not self._closed:
+                while self._must_pause():
+                    self._space.clear()
+                    await self._space.wait()
+                received = await self._session.get_message_async(None)
+                item = await self._process(received)
+                if item is not None:
+                    self._push(item)
+        except asyncio.CancelledError:
+            raise
+        except SlimError as e:
+            # The SLIM session went away underneath us
+            if not self._closed:
+                logger.warning(f"Session read ended: {e}")
+        except Exception:
+            logger.exception("Session read failed")
+        finally:
+            self._push(_END_OF_STREAM)
+
+    def _must_pause(self) -> bool:
+        return (
+            len(self._buf) >= self._max_buffered
+            and not self._pending_requests
+            and not self._sync_callbacks
+            and not self._async_callbacks
+        )
+
+    def _wake_reader(self):
+        if not self._space.is_set():
+            self._space.set()
+
+    def _push(self, item):
+        self._buf.append(item)
+        if not self._avail.is_set():
+            self._avail.set()
+
+    def _ensure_reader(self):
+        """Start the background reader on first use: iteration, a callback or a request().
+        Sessions that only send never start one."""
+        if self._read_task is None:
+            self._avail = asyncio.Event()
+            self._space = asyncio.Event()
+            self._read_task = asyncio.create_task(self._read_loop())
 
     async def __aenter__(self):
-        self._read_task = asyncio.create_task(self._read_loop())
+        self._entered = True
+        if self._sync_callbacks or self._async_callbacks:
+            self._ensure_reader()
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         self._closed = True
+        if self._send_flush_task:
+            # Cancelled under the lock, so never in the middle of a flush
+            async with self._send_lock:
+                self._send_flush_task.cancel()
+            try:
+                await self._send_flush_task
+            except asyncio.CancelledError:
+                pass
+            self._send_flush_task = None
+        if self._send_buf:
+            await self._flush()
+            if self._send_buf:
+                logger.error(f"Dropped {len(self._send_buf)} batched messages on close")
+                for _, _, request_id in self._send_buf:
+                    self._fail_request(request_id, SessionClosedError("Session closed before the request was sent"))
+                self._send_buf.clear()
         if self._read_task:
             self._read_task.cancel()
             try:
@@ -84,10 +201,23 @@ class PASlimSession:
     async def _next_with_context(self):
         if self._closed:
             raise StopAsyncIteration
-        try:
-            return await self._queue.get()
-        except asyncio.CancelledError:
+
+        # Only the reader task awaits the native read, so cancelling the consumer can't drop
+        # a message that the Rust side already completed
+        self._ensure_reader()
+        while not self._buf:
+            self._avail.clear()
+            try:
+                await self._avail.wait()
+            except asyncio.CancelledError:
+                raise StopAsyncIteration
+        if self._buf[0] is _END_OF_STREAM:
+            # Left in place so later calls stop too
             raise StopAsyncIteration
+        item = self._buf.popleft()
+        if len(self._buf) < self._max_buffered:
+            self._wake_reader()
+        return item
 
     async def __anext__(self):
         _, msg = await self._next_with_context()
@@ -97,14 +227,25 @@ class PASlimSession:
         self._outgoing_metadata = metadata
 
     async def send(self, payload: MessagePayload, metadata: Optional[dict[str, str]] = None):
+        await self._send(payload, metadata)
+
+    async def _send(self, payload: MessagePayload, metadata: Optional[dict[str, str]], request_id: Optional[int] = None):
         if self._closed:
             raise SessionClosedError("Session is closed")
         data = encode_message(payload)
-        merged = {**self._outgoing_metadata, **(metadata or {})}
-        await self._session.publish_and_wait_async(data, None, merged or None)
+        # Only build a new dict when there's per-call metadata to layer on top
+        merged = {**self._outgoing_metadata, **metadata} if metadata else self._outgoing_metadata
+        if self._send_batch:
+            # Copied: the session metadata may change before the flush
+            self._send_buf.append((data, dict(merged) if merged else None, request_id))
+            if len(self._send_buf) >= self._batch_max:
+                await self._flush()
+            if self._send_buf:
+                self._schedule_flush()
+        else:
+            await self._session.publish_and_wait_async(data, None, merged or None)
         if self._audit_publisher:
             try:
-                from .session_token import PatternAgentSessionToken
                 token = PatternAgentSessionToken.from_metadata(merged) if merged else None
                 audit_payload = tag_a2a_message(dict(payload)) if isinstance(payload, dict) else payload
                 await self._audit_publisher.publish(
@@ -119,16 +260,80 @@ class PASlimSession:
             except Exception:
                 logger.debug("Audit publish failed", exc_info=True)
 
+    def _schedule_flush(self):
+        if self._send_flush_task is None:
+            self._send_flush_task = asyncio.create_task(self._flush_loop())
+        self._send_pending.set()
+
+    async def _flush_loop(self):
+        while True:
+            await self._send_pending.wait()
+            self._send_pending.clear()
+            await asyncio.sleep(self._batch_interval)
+            await self._flush()
+            if self._send_buf:
+                # Retry what a failed publish left behind on the next interval
+                self._send_pending.set()
+
+    async def _flush(self):
+        """Publish every buffered message, then wait for all deliveries together.
+
+        Errors are logged rather than raised, since the senders have already returned, and
+        fail the request() waiting on that message if there is one. Messages not yet
+        published when a publish fails go back to the front of the buffer.
+        """
+        async with self._send_lock:
+            if not self._send_buf:
+                return
+            buf, self._send_buf = self._send_buf, []
+            handles = []
+            failed = 0
+            try:
+                for data, metadata, _ in buf:
+                    handles.append(await self._session.publish_async(data, None, metadata))
+            except Exception as e:
+                logger.error(f"Batched send failed: {e}", exc_info=True)
+                self._fail_request(buf[len(handles)][2], e)
+                # The message that failed is dropped, the ones after it are retried
+                failed = 1
+            finally:
+                # Also reached on cancellation, so nothing unpublished is lost
+                self._send_buf[:0] = buf[len(handles) + failed:]
+            results = await asyncio.gather(*(handle.wait_async() for handle in handles), return_exceptions=True)
+            for (_, _, request_id), result in zip(buf, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Batched delivery failed: {result}", exc_info=result)
+                    self._fail_request(request_id, result)
+
+    def _fail_request(self, request_id: Optional[int], exc: BaseException):
+        if request_id is None:
+            return
+        future = self._pending_requests.pop(request_id, None)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+
     def on_message(self, callback: Callable[[Any], None]):
-        self._callbacks.append(callback)
+        if asyncio.iscoroutinefunction(callback):
+            self._async_callbacks.append(callback)
+        else:
+            self._sync_callbacks.append(callback)
+        if self._entered:
+            self._ensure_reader()
+            self._wake_reader()
 
     async def request(self, payload: MessagePayload, timeout: Optional[float] = None) -> Any:
         if self._closed:
             raise SessionClosedError("Session is closed")
 
-        request_id = str(uuid.uuid4())
-        future = asyncio.Future()
+        self._ensure_reader()
+        request_id = self._next_request_id
+        self._next_request_id += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
         self._pending_requests[request_id] = future
+        # The reply must be read even if the buffer is full
+        self._wake_reader()
+        timer: Optional[asyncio.TimerHandle] = None
 
         if hasattr(payload, 'model_dump'):
             payload = payload.model_dump()
@@ -138,17 +343,27 @@ class PASlimSession:
         else:
             payload = {"_request_id": request_id, "data": payload}
 
-        await self.send(payload)
-
         try:
+            # Errors from the send, timeouts included, reach the caller as they are
+            await self._send(payload, None, request_id)
             if timeout:
-                return await asyncio.wait_for(future, timeout=timeout)
-            else:
+                # A timer on the future itself, rather than wait_for's wrapper
+                timer = loop.call_later(timeout, self._expire_request, request_id, future)
+            try:
                 return await future
-        except asyncio.TimeoutError:
-            raise PATimeoutError(f"Request timed out after {timeout}s")
+            except asyncio.TimeoutError:
+                raise PATimeoutError(f"Request timed out after {timeout}s")
         finally:
+            if timer:
+                timer.cancel()
+            # Replies and expiry already removed their entry
+            if not future.done() or future.cancelled():
+                self._pending_requests.pop(request_id, None)
+
+    def _expire_request(self, request_id: int, future: asyncio.Future):
+        if not future.done():
             self._pending_requests.pop(request_id, None)
+            future.set_exception(asyncio.TimeoutError())
 
 class PASlimP2PSession(PASlimSession):
     pass
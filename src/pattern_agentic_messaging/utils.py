@@ -1,6 +1,13 @@
+from functools import lru_cache
+
 import slim_bindings
 
 
+@lru_cache(maxsize=4096)
 def parse_name(name_str: str) -> slim_bindings.Name:
-    """Parse 'org/namespace/app' string into slim_bindings.Name."""
+    """Parse 'org/namespace/app' string into slim_bindings.Name.
+
+    Cached: Name is immutable and the bindings clone it on every use, so repeated
+    connects, invites and reconnects to the same peer share one parse.
+    """
     return slim_bindings.Name.from_string(name_str)
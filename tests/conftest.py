@@ -0,0 +1,41 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+
+class FakeCompletionHandle:
+    async def wait_async(self):
+        return None
+
+
+class FakeSlimSession:
+    """In-memory stand-in for a slim_bindings session."""
+
+    def __init__(self):
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self.published = []
+        self.responder = None
+
+    def deliver(self, payload: bytes, metadata=None):
+        ctx = SimpleNamespace(metadata=metadata or {})
+        self.inbox.put_nowait(SimpleNamespace(context=ctx, payload=payload))
+
+    async def get_message_async(self, timeout):
+        return await self.inbox.get()
+
+    async def publish_and_wait_async(self, data, payload_type, metadata):
+        self.published.append((data, metadata))
+        if self.responder:
+            reply = self.responder(data)
+            if reply is not None:
+                self.deliver(reply)
+
+    async def publish_async(self, data, payload_type, metadata):
+        await self.publish_and_wait_async(data, payload_type, metadata)
+        return FakeCompletionHandle()
+
+
+@pytest.fixture
+def slim_session():
+    return FakeSlimSession()
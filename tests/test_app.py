@@ -0,0 +1,229 @@
+import asyncio
+import os
+import signal
+
+import pytest
+from pydantic import BaseModel
+from typing import Literal
+from pattern_agentic_messaging import PASlimApp, PASlimConfig
+
+
+class FakeSlimApp:
+    def __init__(self):
+        self.incoming: asyncio.Queue = asyncio.Queue()
+
+    async def listen_for_session_async(self, timeout):
+        item = await self.incoming.get()
+        if isinstance(item, BaseException):
+            raise item
+        return item
+
+
+class OfflineApp(PASlimApp):
+    """PASlimApp wired to FakeSlimApp instead of a SLIM connection."""
+
+    async def __aenter__(self):
+        self._app = FakeSlimApp()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._app = None
+
+
+class Prompt(BaseModel):
+    type: Literal["prompt"] = "prompt"
+    text: str
+
+
+class Ping(BaseModel):
+    seq: int
+
+
+@pytest.fixture
+def app():
+    app = PASlimApp(PASlimConfig(local_name="org/ns/server", endpoint="http://localhost"))
+    app._app = FakeSlimApp()
+    return app
+
+
+async def test_messages_yields_from_sessions(app, slim_session):
+    app._app.incoming.put_nowait(slim_session)
+    slim_session.deliver(b'{"type": "ping"}')
+
+    stream = app.messages()
+    session, _, msg = await asyncio.wait_for(anext(stream), timeout=1)
+    assert msg == {"type": "ping"}
+    await stream.aclose()
+
+
+async def test_close_runs_disconnect_handler(app, slim_session):
+    disconnected = []
+
+    @app.on_session_disconnect
+    async def on_disconnect(session):
+        disconnected.append(session)
+
+    app._app.incoming.put_nowait(slim_session)
+    slim_session.deliver(b"hi")
+    stream = app.messages()
+    session, _, _ = await asyncio.wait_for(anext(stream), timeout=1)
+    await stream.aclose()
+    assert disconnected == [session]
+
+
+async def test_messages_burst_preserves_order(app, slim_session):
+    app._app.incoming.put_nowait(slim_session)
+    for i in range(100):
+        slim_session.deliver(f'{{"seq": {i}}}'.encode())
+
+    stream = app.messages()
+    seen = [(await asyncio.wait_for(anext(stream), timeout=1))[2]["seq"] for _ in range(100)]
+    assert seen == list(range(100))
+    await stream.aclose()
+
+
+async def test_messages_backpressure(slim_session):
+    app = PASlimApp(PASlimConfig(local_name="org/ns/server", endpoint="http://localhost", max_inflight=4))
+    app._app = FakeSlimApp()
+    app._app.incoming.put_nowait(slim_session)
+    for i in range(20):
+        slim_session.deliver(f'{{"seq": {i}}}'.encode())
+
+    stream = app.messages()
+    assert (await asyncio.wait_for(anext(stream), timeout=1))[2]["seq"] == 0
+    await asyncio.sleep(0.01)
+    # Reader is parked on the full queue rather than buffering everything
+    assert slim_session.inbox.qsize() > 0
+    seen = [(await asyncio.wait_for(anext(stream), timeout=1))[2]["seq"] for _ in range(19)]
+    assert seen == list(range(1, 20))
+    await stream.aclose()
+
+
+async def test_stop_wakes_idle_messages(app):
+    received = []
+
+    async def consume():
+        async for item in app:
+            received.append(item)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    app.stop()
+    await asyncio.wait_for(task, timeout=1)
+    assert received == []
+
+
+def test_messages_across_event_loops(slim_session):
+    app = PASlimApp(PASlimConfig(local_name="org/ns/server", endpoint="http://localhost"))
+
+    async def two_messages(slim_session):
+        app._app = FakeSlimApp()
+        app._app.incoming.put_nowait(slim_session)
+        stream = app.messages()
+        try:
+            seen = []
+            for payload in (b"a", b"b"):
+                slim_session.deliver(payload)
+                seen.append((await asyncio.wait_for(anext(stream), timeout=1))[2])
+            return seen
+        finally:
+            await stream.aclose()
+
+    # A fresh loop each time, as with repeated run() calls
+    for _ in range(2):
+        assert asyncio.run(two_messages(type(slim_session)())) == ["a", "b"]
+
+
+async def test_listener_crash_is_raised(app):
+    app._app.incoming.put_nowait(RuntimeError("listener died"))
+    with pytest.raises(RuntimeError, match="listener died"):
+        async for _ in app:
+            pass
+
+
+async def test_handler_dispatch(slim_session):
+    app = OfflineApp(PASlimConfig(local_name="org/ns/server", endpoint="http://localhost", message_discriminator="type"))
+    calls = []
+
+    @app.on_message
+    async def on_ping(session, msg: Ping):
+        calls.append(("ping", msg.seq))
+
+    @app.on_message
+    async def on_prompt(session, msg: Prompt):
+        calls.append(("prompt", msg.text))
+
+    @app.on_message("status")
+    async def on_status(session, msg):
+        calls.append(("status", msg["value"]))
+
+    @app.on_message
+    async def on_other(session, msg):
+        calls.append(("other", msg))
+        if msg == "stop":
+            app.stop()
+
+    async def feed():
+        while app._app is None:
+            await asyncio.sleep(0)
+        for payload in (
+            b'{"type": "prompt", "text": "hi"}',
+            b'{"type": "prompt"}',
+            b'{"type": "status", "value": "ready"}',
+            b'{"type": "status", "seq": 3}',
+            b'{"type": ["unhashable"]}',
+            b'stop',
+        ):
+            slim_session.deliver(payload)
+        app._app.incoming.put_nowait(slim_session)
+
+    feeder = asyncio.create_task(feed())
+    await asyncio.wait_for(app._run_async(), timeout=1)
+    await feeder
+
+    assert calls == [
+        ("prompt", "hi"),
+        ("status", "ready"),
+        ("ping", 3),
+        ("other", {"type": ["unhashable"]}),
+        ("other", "stop"),
+    ]
+
+
+def _stop_on_init_app():
+    app = OfflineApp(PASlimConfig(local_name="org/ns/server", endpoint="http://localhost"))
+
+    @app.on_message
+    async def handler(session, msg):
+        pass
+
+    @app.on_init
+    async def send_sigint():
+        # run() has installed its handlers by the time init handlers run
+        os.kill(os.getpid(), signal.SIGINT)
+
+    return app
+
+
+def test_run_stops_on_sigint():
+    app = _stop_on_init_app()
+    app.run()
+    assert not app._running
+
+
+class NoSignalHandlerLoop(asyncio.SelectorEventLoop):
+    """Event loop without add_signal_handler, as on Windows."""
+
+    def add_signal_handler(self, sig, callback, *args):
+        raise NotImplementedError
+
+
+def test_run_signal_fallback(monkeypatch):
+    monkeypatch.setattr(asyncio, "new_event_loop", NoSignalHandlerLoop)
+    previous = signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)
+
+    app = _stop_on_init_app()
+    app.run()
+
+    assert not app._running
+    assert (signal.getsignal(signal.SIGINT), signal.getsignal(signal.SIGTERM)) == previous
@@ -0,0 +1,55 @@
+from dataclasses import replace
+
+import pytest
+from pattern_agentic_messaging import PASlimConfig, PASlimConfigP2P, PASlimConfigGroup, SlimConnectionPool
+
+ENDPOINT = "http://localhost"
+
+
+def test_valid_names():
+    config = PASlimConfigGroup(
+        local_name="org/ns/app",
+        endpoint=ENDPOINT,
+        channel_name="org/ns/channel",
+        invites=["org/ns/a", "org/ns/b"],
+    )
+    assert config.invites == ["org/ns/a", "org/ns/b"]
+    assert PASlimConfigP2P(local_name="org/ns/app", endpoint=ENDPOINT, peer_name="org/ns/peer").peer_name == "org/ns/peer"
+
+
+@pytest.mark.parametrize("name", ["app", "org/ns", "org/ns/app/inst"])
+def test_malformed_local_name(name):
+    with pytest.raises(ValueError, match="local_name"):
+        PASlimConfig(local_name=name, endpoint=ENDPOINT)
+
+
+def test_malformed_peer_name():
+    with pytest.raises(ValueError, match="peer_name"):
+        PASlimConfigP2P(local_name="org/ns/app", endpoint=ENDPOINT, peer_name="org/peer")
+
+
+def test_malformed_channel_name():
+    with pytest.raises(ValueError, match="channel_name"):
+        PASlimConfigGroup(local_name="org/ns/app", endpoint=ENDPOINT, channel_name="channel")
+
+
+def test_malformed_invite():
+    with pytest.raises(ValueError, match="invites"):
+        PASlimConfigGroup(local_name="org/ns/app", endpoint=ENDPOINT, invites=["org/ns/a", "b"])
+
+
+def test_invites_none():
+    assert PASlimConfigGroup(local_name="org/ns/app", endpoint=ENDPOINT, invites=None).invites is None
+
+
+def test_empty_local_name_is_a_template():
+    template = PASlimConfig(local_name="", endpoint=ENDPOINT)
+    assert replace(template, local_name="org/ns/app").local_name == "org/ns/app"
+    pool = SlimConnectionPool(ENDPOINT)
+    assert pool._template.local_name == ""
+
+
+def test_replace_revalidates():
+    config = PASlimConfig(local_name="org/ns/app", endpoint=ENDPOINT)
+    with pytest.raises(ValueError, match="local_name"):
+        replace(config, local_name="org/ns")
@@ -1,7 +1,19 @@
+import importlib
+import sys
+
 import pytest
+from pattern_agentic_messaging import messages
 from pattern_agentic_messaging.messages import encode_message, decode_message
 from pattern_agentic_messaging.exceptions import SerializationError
 
+@pytest.fixture
+def stdlib_messages(monkeypatch):
+    """The messages module as loaded without orjson."""
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    yield importlib.reload(messages)
+    monkeypatch.undo()
+    importlib.reload(messages)
+
 def test_encode_bytes():
     data = b"raw bytes"
     assert encode_message(data) == data
@@ -11,7 +23,13 @@ def test_encode_str():
 
 def test_encode_dict():
     result = encode_message({"type": "ping"})
-    assert result == b'{"type": "ping"}'
+    assert result == b'{"type":"ping"}'
+
+def test_encode_dict_non_str_keys():
+    assert encode_message({1: "a"}) == b'{"1":"a"}'
+
+def test_encode_dict_big_int():
+    assert encode_message({"id": 2**70}) == b'{"id":1180591620717411303424}'
 
 def test_encode_invalid():
     with pytest.raises(SerializationError):
@@ -41,4 +59,52 @@ def test_encode_pydantic_model():
 
     msg = TestMessage(type="test", value=42)
     result = encode_message(msg)
-    assert result == b'{"type": "test", "value": 42}'
+    assert result == b'{"type":"test","value":42}'
+
+def test_decode_json_array():
+    assert decode_message(b'[1, 2, 3]') == [1, 2, 3]
+
+def test_decode_brace_prefixed_text():
+    assert decode_message(b"{not json") == "{not json"
+
+def test_decode_brace_prefixed_binary():
+    data = b'{"a": "\x00"}'
+    assert decode_message(data) == data
+
+def test_decode_utf16_binary():
+    data = '{"a":1}'.encode('utf-16-le')
+    assert decode_message(data) == data
+
+def test_decode_utf16_binary_stdlib(stdlib_messages):
+    assert not stdlib_messages.ORJSON_AVAILABLE
+    data = '{"a":1}'.encode('utf-16-le')
+    assert stdlib_messages.decode_message(data) == data
+    assert stdlib_messages.decode_message(b'{"a": 1}') == {"a": 1}
+
+@pytest.mark.parametrize("data, expected", [
+    (b'{"a": NaN}', {"a": float("nan")}),
+    (b'{"a": -Infinity}', {"a": float("-inf")}),
+    (b'[1e400]', [float("inf")]),
+    (b'{"a":"\\ud800"}', {"a": "\ud800"}),
+])
+def test_decode_json_beyond_orjson(data, expected):
+    # Compared via repr so NaN equals itself
+    assert repr(decode_message(data)) == repr(expected)
+
+def test_encode_non_finite_float(stdlib_messages):
+    assert stdlib_messages.encode_message({"a": float("nan")}) == b'{"a":NaN}'
+
+def test_encode_non_finite_float_orjson():
+    if not messages.ORJSON_AVAILABLE:
+        pytest.skip("orjson not installed")
+    assert encode_message({"a": float("nan")}) == b'{"a":null}'
+
+def test_encode_pydantic_model_datetime():
+    from datetime import datetime, timezone
+    from pydantic import BaseModel
+
+    class Stamped(BaseModel):
+        at: datetime
+
+    msg = Stamped(at=datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc))
+    assert encode_message(msg) == b'{"at":"2024-01-02T03:04:05Z"}'
@@ -0,0 +1,271 @@
+import asyncio
+import json
+
+import pytest
+from slim_bindings import SlimError
+from pattern_agentic_messaging import PASlimSession, TimeoutError
+
+
+def echo_reply(data: bytes) -> bytes:
+    msg = json.loads(data)
+    return json.dumps({"_request_id": msg["_request_id"], "echo": msg["q"]}).encode()
+
+
+async def test_iterates_messages(slim_session):
+    slim_session.deliver(b'{"type": "hello"}')
+    slim_session.deliver(b"plain")
+    async with PASlimSession(slim_session) as session:
+        # The reader starts on first use
+        assert session._read_task is None
+        assert await anext(session) == {"type": "hello"}
+        assert await anext(session) == "plain"
+
+
+async def test_cancelled_read_loses_nothing(slim_session):
+    async with PASlimSession(slim_session) as session:
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(anext(session), timeout=0.01)
+        slim_session.deliver(b"late")
+        assert await asyncio.wait_for(anext(session), timeout=1) == "late"
+
+
+async def test_reader_failure_ends_iteration(slim_session):
+    async def broken(timeout):
+        raise RuntimeError("connection lost")
+
+    slim_session.get_message_async = broken
+    session = PASlimSession(slim_session)
+    session.on_message(lambda msg: None)
+    async with session:
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(anext(session), timeout=1)
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(anext(session), timeout=1)
+
+
+async def test_session_error_ends_iteration(slim_session):
+    async def closed(timeout):
+        raise SlimError.SessionError(message="session closed")
+
+    slim_session.get_message_async = closed
+    async with PASlimSession(slim_session) as session:
+        with pytest.raises(StopAsyncIteration):
+            await anext(session)
+
+
+@pytest.mark.parametrize("with_reader", [False, True])
+async def test_unexpected_read_error_is_logged(slim_session, caplog, with_reader):
+    async def broken(timeout):
+        raise RuntimeError("bug")
+
+    slim_session.get_message_async = broken
+    session = PASlimSession(slim_session)
+    if with_reader:
+        session.on_message(lambda msg: None)
+    async with session:
+        for _ in range(2):
+            with pytest.raises(StopAsyncIteration):
+                await asyncio.wait_for(anext(session), timeout=1)
+    assert "Session read failed" in caplog.text
+    assert "RuntimeError: bug" in caplog.text
+
+
+async def test_request_reply(slim_session):
+    slim_session.responder = echo_reply
+    async with PASlimSession(slim_session) as session:
+        first = await session.request({"q": "a"}, timeout=1)
+        second = await session.request({"q": "b"}, timeout=1)
+    assert first["echo"] == "a"
+    assert second["echo"] == "b"
+    assert second["_request_id"] == first["_request_id"] + 1
+    assert session._pending_requests == {}
+
+
+async def test_request_ignores_foreign_request_id(slim_session):
+    async with PASlimSession(slim_session) as session:
+        task = asyncio.create_task(session.request({"q": "a"}, timeout=1))
+        while not slim_session.published:
+            await asyncio.sleep(0)
+        request_id = json.loads(slim_session.published[0][0])["_request_id"]
+        slim_session.deliver(json.dumps({"_request_id": str(request_id)}).encode())
+        slim_session.deliver(json.dumps({"_request_id": request_id, "ok": True}).encode())
+        assert (await task)["ok"] is True
+        assert await asyncio.wait_for(anext(session), timeout=1) == {"_request_id": str(request_id)}
+
+
+async def test_request_while_iterating_keeps_order(slim_session):
+    async with PASlimSession(slim_session) as session:
+        # Consumer already waiting when the request is issued
+        first = asyncio.create_task(anext(session))
+        await asyncio.sleep(0)
+        task = asyncio.create_task(session.request({"q": "a"}, timeout=1))
+        while not slim_session.published:
+            await asyncio.sleep(0)
+        request_id = json.loads(slim_session.published[0][0])["_request_id"]
+        slim_session.deliver(json.dumps({"_request_id": request_id}).encode())
+        for i in range(5):
+            slim_session.deliver(json.dumps({"seq": i}).encode())
+        await task
+        seen = [await asyncio.wait_for(first, timeout=1)]
+        seen += [await asyncio.wait_for(anext(session), timeout=1) for _ in range(4)]
+    assert seen == [{"seq": i} for i in range(5)]
+
+
+async def test_reader_pauses_when_buffer_full(slim_session):
+    for i in range(10):
+        slim_session.deliver(json.dumps({"seq": i}).encode())
+    async with PASlimSession(slim_session, max_buffered=3) as session:
+        assert await anext(session) == {"seq": 0}
+        await asyncio.sleep(0.01)
+        assert len(session._buf) == 3
+        assert slim_session.inbox.qsize() == 6
+
+        # A pending request keeps the reader going so its reply arrives
+        slim_session.responder = echo_reply
+        assert (await session.request({"q": "a"}, timeout=1))["echo"] == "a"
+        seen = [await anext(session) for _ in range(9)]
+    assert seen == [{"seq": i} for i in range(1, 10)]
+
+
+async def test_request_timeout(slim_session):
+    async with PASlimSession(slim_session) as session:
+        with pytest.raises(TimeoutError):
+            await session.request({"q": "a"}, timeout=0.01)
+    assert session._pending_requests == {}
+
+
+async def test_callbacks(slim_session):
+    seen = []
+
+    def sync_cb(msg):
+        seen.append(("sync", msg))
+
+    async def async_cb(msg):
+        seen.append(("async", msg))
+
+    async def failing_cb(msg):
+        raise RuntimeError("boom")
+
+    session = PASlimSession(slim_session)
+    session.on_message(async_cb)
+    session.on_message(failing_cb)
+    session.on_message(sync_cb)
+    slim_session.deliver(b'{"n": 1}')
+    async with session:
+        assert await asyncio.wait_for(anext(session), timeout=1) == {"n": 1}
+    assert seen == [("sync", {"n": 1}), ("async", {"n": 1})]
+
+
+async def test_batched_send(slim_session):
+    async with PASlimSession(slim_session, send_batch=True, batch_interval=0.01, batch_max=3) as session:
+        await session.send({"n": 1})
+        await session.send({"n": 2})
+        assert slim_session.published == []
+        await session.send({"n": 3})
+        assert len(slim_session.published) == 3
+
+        await session.send({"n": 4})
+        await asyncio.sleep(0.05)
+        assert len(slim_session.published) == 4
+
+        await session.send({"n": 5})
+    assert [json.loads(data)["n"] for data, _ in slim_session.published] == [1, 2, 3, 4, 5]
+
+
+async def test_close_during_slow_flush(slim_session):
+    publish = slim_session.publish_async
+
+    async def slow_publish(data, payload_type, metadata):
+        await asyncio.sleep(0.01)
+        return await publish(data, payload_type, metadata)
+
+    slim_session.publish_async = slow_publish
+    async with PASlimSession(slim_session, send_batch=True, batch_interval=0.001) as session:
+        for i in range(5):
+            await session.send({"n": i})
+        # Close while the flush task is partway through publishing
+        while not slim_session.published:
+            await asyncio.sleep(0.001)
+    assert [json.loads(data)["n"] for data, _ in slim_session.published] == [0, 1, 2, 3, 4]
+
+
+async def test_batched_publish_failure_keeps_the_rest(slim_session, caplog):
+    publish = slim_session.publish_async
+
+    async def flaky_publish(data, payload_type, metadata):
+        if json.loads(data)["n"] == 1:
+            raise RuntimeError("publish failed")
+        return await publish(data, payload_type, metadata)
+
+    slim_session.publish_async = flaky_publish
+    async with PASlimSession(slim_session, send_batch=True, batch_interval=0.001, batch_max=4) as session:
+        for i in range(4):
+            await session.send({"n": i})
+    assert [json.loads(data)["n"] for data, _ in slim_session.published] == [0, 2, 3]
+    assert "publish failed" in caplog.text
+
+
+async def test_batched_request_publish_failure_fails_request(slim_session):
+    async def failing_publish(data, payload_type, metadata):
+        raise RuntimeError("publish failed")
+
+    slim_session.publish_async = failing_publish
+    async with PASlimSession(slim_session, send_batch=True, batch_interval=0.001) as session:
+        with pytest.raises(RuntimeError, match="publish failed"):
+            await asyncio.wait_for(session.request({"q": "a"}), timeout=1)
+    assert session._pending_requests == {}
+
+
+async def test_batched_request_delivery_failure_fails_request(slim_session):
+    class FailedDelivery:
+        async def wait_async(self):
+            raise RuntimeError("delivery failed")
+
+    async def publish(data, payload_type, metadata):
+        return FailedDelivery()
+
+    slim_session.publish_async = publish
+    async with PASlimSession(slim_session, send_batch=True, batch_interval=0.001) as session:
+        with pytest.raises(RuntimeError, match="delivery failed"):
+            await asyncio.wait_for(session.request({"q": "a"}), timeout=1)
+    assert session._pending_requests == {}
+
+
+async def test_request_send_failure_clears_pending(slim_session):
+    async def failing_publish(data, payload_type, metadata):
+        raise RuntimeError("send failed")
+
+    slim_session.publish_and_wait_async = failing_publish
+    async with PASlimSession(slim_session) as session:
+        with pytest.raises(RuntimeError):
+            await session.request({"q": "a"}, timeout=1)
+    assert session._pending_requests == {}
+
+
+async def test_request_send_timeout_is_not_a_reply_timeout(slim_session):
+    async def slow_publish(data, payload_type, metadata):
+        raise asyncio.TimeoutError()
+
+    slim_session.publish_and_wait_async = slow_publish
+    async with PASlimSession(slim_session) as session:
+        with pytest.raises(asyncio.TimeoutError) as excinfo:
+            await session.request({"q": "a"})
+    assert not isinstance(excinfo.value, TimeoutError)
+    assert session._pending_requests == {}
+
+
+async def test_cancelled_request_clears_pending(slim_session):
+    async with PASlimSession(slim_session) as session:
+        task = asyncio.create_task(session.request({"q": "a"}, timeout=5))
+        while not slim_session.published:
+            await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert session._pending_requests == {}
+
+
+def test_session_id_is_stable(slim_session):
+    session = PASlimSession(slim_session)
+    assert session.session_id == session.session_id
+    assert session.session_id != PASlimSession(slim_session).session_id
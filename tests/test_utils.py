@@ -0,0 +1,16 @@
+import pytest
+from slim_bindings import SlimError
+from pattern_agentic_messaging.utils import parse_name
+
+
+def test_parse_name():
+    assert parse_name("org/ns/app").components() == ["org", "ns", "app"]
+
+
+def test_parse_name_is_cached():
+    assert parse_name("org/ns/cached") is parse_name("org/ns/cached")
+
+
+def test_parse_name_invalid():
+    with pytest.raises(SlimError):
+        parse_name("org/ns")